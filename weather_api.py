@@ -5,127 +5,400 @@ Provides weather data endpoints for the weather app frontend
 """
 
 from flask import Flask, jsonify, request
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
-import requests
+import httpx
 import os
-from datetime import datetime, timedelta
-import json
+import sys
+import hashlib
+import logging
+from logging.handlers import RotatingFileHandler
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed, wait
+from concurrent.futures import TimeoutError as FuturesTimeoutError
+from collections import Counter
+from datetime import datetime, timezone
+from itertools import groupby, islice
+from operator import itemgetter
+
+try:
+    import orjson
+except ImportError:  # Fall back to the stdlib json module
+    orjson = None
+
+try:
+    import h2  # noqa: F401  (enables HTTP/2 in httpx)
+except ImportError:  # Without h2 the client falls back to HTTP/1.1 keep-alive
+    h2 = None
+
+try:
+    import redis
+except ImportError:  # Redis is optional; without it only the in-process cache is used
+    redis = None
+
+class OrjsonProvider(DefaultJSONProvider):
+    """JSON provider that uses orjson for faster (de)serialization"""
+    
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj).decode()
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+class RedactingFormatter(logging.Formatter):
+    """Log formatter that masks the OpenWeather API key (it appears in upstream URLs)"""
+    
+    def format(self, record):
+        message = super().format(record)
+        if OPENWEATHER_API_KEY:
+            message = message.replace(OPENWEATHER_API_KEY, '***')
+        return message
+
+# Logging (set LOG_FILE to write to a rotating log file instead of stderr)
+LOG_FILE = os.getenv('LOG_FILE')
+_log_handler = RotatingFileHandler(LOG_FILE, maxBytes=10 * 1024 * 1024, backupCount=5) if LOG_FILE else logging.StreamHandler()
+_log_handler.setFormatter(RedactingFormatter('%(asctime)s %(levelname)s %(name)s: %(message)s'))
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+logger.addHandler(_log_handler)
+logger.propagate = False
+
+# httpx/httpcore log full request URLs at INFO, which include the API key
+logging.getLogger('httpx').setLevel(logging.WARNING)
+logging.getLogger('httpcore').setLevel(logging.WARNING)
 
 app = Flask(__name__)
+if orjson:
+    app.json = OrjsonProvider(app)
 CORS(app)  # Enable CORS for frontend requests
 
 # Configuration
 OPENWEATHER_API_KEY = os.getenv('OPENWEATHER_API_KEY', 'your_api_key_here')
 OPENWEATHER_BASE_URL = 'https://api.openweathermap.org/data/2.5'
+REDIS_URL = os.getenv('REDIS_URL')
+# How long stale entries stay in Redis as a fallback when OpenWeather is down
+STALE_GRACE_PERIOD = int(os.getenv('STALE_GRACE_PERIOD', 24 * 3600))
+
+# Shared HTTP/2 client so concurrent OpenWeather requests share one kept-alive connection
+_client = httpx.Client(
+    http2=h2 is not None,
+    timeout=10,
+    limits=httpx.Limits(max_connections=20, max_keepalive_connections=10)
+)
+
+def get_client():
+    """Return the shared HTTP client used for OpenWeather requests"""
+    return _client
+
+# Shared response cache across workers (configure Redis with maxmemory-policy allkeys-lfu)
+_redis = redis.Redis.from_url(REDIS_URL, decode_responses=True) if redis and REDIS_URL else None
+
+def get_redis():
+    """Return the shared Redis client, or None when Redis is not configured"""
+    return _redis
+
+# OpenWeather icon code to Font Awesome class (values interned since they are reused constantly)
+_ICON_MAP = {code: sys.intern(icon_class) for code, icon_class in {
+    '01d': 'fas fa-sun',           # clear sky day
+    '01n': 'fas fa-moon',          # clear sky night
+    '02d': 'fas fa-cloud-sun',     # few clouds day
+    '02n': 'fas fa-cloud-moon',    # few clouds night
+    '03d': 'fas fa-cloud',         # scattered clouds
+    '03n': 'fas fa-cloud',
+    '04d': 'fas fa-cloud',         # broken clouds
+    '04n': 'fas fa-cloud',
+    '09d': 'fas fa-cloud-rain',    # shower rain
+    '09n': 'fas fa-cloud-rain',
+    '10d': 'fas fa-cloud-sun-rain', # rain day
+    '10n': 'fas fa-cloud-moon-rain', # rain night
+    '11d': 'fas fa-bolt',          # thunderstorm
+    '11n': 'fas fa-bolt',
+    '13d': 'fas fa-snowflake',     # snow
+    '13n': 'fas fa-snowflake',
+    '50d': 'fas fa-smog',          # mist
+    '50n': 'fas fa-smog'
+}.items()}
+_DEFAULT_ICON = sys.intern('fas fa-cloud')
+
+# Marks upstream data served from the stale-if-error fallback
+_STALE_KEY = '_stale'
+
+def _describe_error(error):
+    """Summarize an upstream error without its message (which may contain the request URL)"""
+    response = getattr(error, 'response', None)
+    if response is not None:
+        return f"HTTP {response.status_code}"
+    return type(error).__name__
+
+class ResponseCache:
+    """Thread-safe in-process TTL cache for parsed OpenWeather responses"""
+    
+    def __init__(self, ttl, maxsize=1024):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = {}
+        self._lock = threading.Lock()
+    
+    def get(self, key, record_stats=True):
+        """Return the cached data for key, or None if missing or stale"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry['stale_at'] > time.time():
+                if record_stats:
+                    self.hits += 1
+                return entry['data']
+            if record_stats:
+                self.misses += 1
+            return None
+    
+    def set(self, key, data):
+        """Store data under key until the TTL expires"""
+        now = time.time()
+        with self._lock:
+            self._entries.pop(key, None)
+            if len(self._entries) >= self.maxsize:
+                # Drop the oldest entry (dicts keep insertion order)
+                self._entries.pop(next(iter(self._entries)))
+            self._entries[key] = {
+                'data': data,
+                'timestamp_generated': now,
+                'stale_at': now + self.ttl
+            }
+    
+    def stats(self):
+        """Return cache statistics for the health endpoint"""
+        with self._lock:
+            return {
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+                'ttl': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses
+            }
 
 class WeatherService:
     """Service class to handle weather API operations"""
     
-    def __init__(self, api_key):
+    def __init__(self, api_key, client=None, redis_client=None):
         self.api_key = api_key
         self.base_url = OPENWEATHER_BASE_URL
+        self.client = client or get_client()
+        self.redis = redis_client or get_redis()
+        self.current_cache = ResponseCache(ttl=600)
+        self.forecast_cache = ResponseCache(ttl=1800)
+        self._inflight = {}
+        self._inflight_lock = threading.Lock()
     
-    def get_current_weather(self, city=None, lat=None, lon=None):
-        """Get current weather data"""
+    @staticmethod
+    def cache_key(city=None, lat=None, lon=None):
+        """Build a normalized cache key for a city or coordinates lookup"""
+        if city:
+            return (city.strip().lower(), None, None)
+        try:
+            return (None, round(float(lat), 2), round(float(lon), 2))
+        except (TypeError, ValueError):
+            return None
+    
+    def _shared_get(self, shared_key):
+        """Read an entry from the shared Redis cache"""
+        if self.redis is None:
+            return None
         try:
-            if city:
-                url = f"{self.base_url}/weather"
-                params = {
-                    'q': city,
-                    'appid': self.api_key,
-                    'units': 'metric'
-                }
-            elif lat and lon:
-                url = f"{self.base_url}/weather"
-                params = {
-                    'lat': lat,
-                    'lon': lon,
-                    'appid': self.api_key,
-                    'units': 'metric'
-                }
-            else:
+            entry = self.redis.hgetall(shared_key)
+            if not entry:
                 return None
-            
-            response = requests.get(url, params=params, timeout=10)
-            response.raise_for_status()
-            return response.json()
+            return {
+                'body': app.json.loads(entry['body']),
+                'stale_at': float(entry['stale_at'])
+            }
+        except (redis.exceptions.RedisError, KeyError, ValueError):
+            logger.exception("Error reading shared cache")
+            return None
+    
+    def _shared_set(self, shared_key, data, ttl):
+        """Write an entry to the shared Redis cache, kept past its TTL for fallback"""
+        if self.redis is None:
+            return
+        now = time.time()
+        try:
+            pipe = self.redis.pipeline()
+            pipe.hset(shared_key, mapping={
+                'body': app.json.dumps(data),
+                'status': 200,
+                'generated': now,
+                'stale_at': now + ttl
+            })
+            pipe.expire(shared_key, ttl + STALE_GRACE_PERIOD)
+            pipe.execute()
+        except redis.exceptions.RedisError:
+            logger.exception("Error writing shared cache")
+    
+    def _inflight_timeout(self):
+        """How long to wait on another caller's in-flight request, or None for no limit"""
+        # The client timeout applies per phase, so a request can take their sum
+        timeout = getattr(self.client, 'timeout', None)
+        phases = [getattr(timeout, phase, None) for phase in ('connect', 'read', 'write', 'pool')]
+        if None in phases:
+            return None
+        return sum(phases) + 1
+    
+    def _fetch(self, endpoint, cache, city=None, lat=None, lon=None):
+        """Fetch an OpenWeather endpoint, serving repeat queries from cache"""
+        if city:
+            params = {'q': city}
+        elif lat is not None and lon is not None:
+            params = {'lat': lat, 'lon': lon}
+        else:
+            return None
+        
+        key = self.cache_key(city=city, lat=lat, lon=lon)
+        if key is None:
+            return None
+        
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
+        
+        # Single-flight: concurrent callers for the same key share one upstream call
+        flight_key = (endpoint, key)
+        with self._inflight_lock:
+            future = self._inflight.get(flight_key)
+            is_leader = future is None
+            if is_leader:
+                future = Future()
+                self._inflight[flight_key] = future
+        
+        if not is_leader:
+            try:
+                return future.result(timeout=self._inflight_timeout())
+            except FuturesTimeoutError:
+                raise httpx.TimeoutException(f"Timed out waiting for in-flight {endpoint} request")
+        
+        try:
+            # A previous leader may have filled the cache just before we took its slot
+            data = cache.get(key, record_stats=False)
+            if data is None:
+                data = self._load(endpoint, cache, key, params)
+            future.set_result(data)
+            return data
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._inflight_lock:
+                self._inflight.pop(flight_key, None)
+    
+    def _load(self, endpoint, cache, key, params):
+        """Load data from the shared cache or OpenWeather and populate the caches"""
+        shared_key = 'weather:' + hashlib.sha1(f"{endpoint}:{key!r}".encode()).hexdigest()
+        shared = self._shared_get(shared_key)
+        if shared and shared['stale_at'] > time.time():
+            cache.set(key, shared['body'])
+            return shared['body']
         
-        except requests.exceptions.RequestException as e:
-            print(f"Error fetching current weather: {e}")
+        params.update({
+            'appid': self.api_key,
+            'units': 'metric'
+        })
+        try:
+            response = self.client.get(f"{self.base_url}/{endpoint}", params=params)
+            response.raise_for_status()
+            data = app.json.loads(response.content)
+        except (httpx.HTTPError, ValueError) as e:
+            # ValueError covers non-JSON bodies (e.g. proxy error pages) from either JSON backend
+            if shared:
+                logger.warning("Serving stale %s data after upstream error: %s", endpoint, _describe_error(e))
+                return dict(shared['body'], **{_STALE_KEY: True})
+            raise
+        cache.set(key, data)
+        self._shared_set(shared_key, data, cache.ttl)
+        return data
+    
+    @staticmethod
+    def _log_status_error(what, error):
+        """Log an upstream error status; 4xx (e.g. unknown city) is routine, 5xx is not"""
+        status = error.response.status_code
+        if status < 500:
+            logger.warning("OpenWeather returned %s for %s", status, what)
+        else:
+            logger.exception("OpenWeather returned %s for %s", status, what)
+    
+    def get_current_weather(self, city=None, lat=None, lon=None):
+        """Get current weather data"""
+        try:
+            return self._fetch('weather', self.current_cache, city=city, lat=lat, lon=lon)
+        except httpx.HTTPStatusError as e:
+            self._log_status_error('current weather', e)
+            return None
+        except (httpx.HTTPError, ValueError):
+            logger.exception("Error fetching current weather")
             return None
     
     def get_forecast(self, city=None, lat=None, lon=None):
         """Get 5-day weather forecast"""
         try:
-            if city:
-                url = f"{self.base_url}/forecast"
-                params = {
-                    'q': city,
-                    'appid': self.api_key,
-                    'units': 'metric'
-                }
-            elif lat and lon:
-                url = f"{self.base_url}/forecast"
-                params = {
-                    'lat': lat,
-                    'lon': lon,
-                    'appid': self.api_key,
-                    'units': 'metric'
-                }
-            else:
-                return None
-            
-            response = requests.get(url, params=params, timeout=10)
-            response.raise_for_status()
-            return response.json()
-        
-        except requests.exceptions.RequestException as e:
-            print(f"Error fetching forecast: {e}")
+            return self._fetch('forecast', self.forecast_cache, city=city, lat=lat, lon=lon)
+        except httpx.HTTPStatusError as e:
+            self._log_status_error('forecast', e)
+            return None
+        except (httpx.HTTPError, ValueError):
+            logger.exception("Error fetching forecast")
             return None
     
-    def get_weather_icon_class(self, weather_code, is_day=True):
+    def get_weather_icon_class(self, weather_code):
         """Convert OpenWeather icon code to Font Awesome class"""
-        icon_mapping = {
-            '01d': 'fas fa-sun',           # clear sky day
-            '01n': 'fas fa-moon',          # clear sky night
-            '02d': 'fas fa-cloud-sun',     # few clouds day
-            '02n': 'fas fa-cloud-moon',    # few clouds night
-            '03d': 'fas fa-cloud',         # scattered clouds
-            '03n': 'fas fa-cloud',
-            '04d': 'fas fa-cloud',         # broken clouds
-            '04n': 'fas fa-cloud',
-            '09d': 'fas fa-cloud-rain',    # shower rain
-            '09n': 'fas fa-cloud-rain',
-            '10d': 'fas fa-cloud-sun-rain', # rain day
-            '10n': 'fas fa-cloud-moon-rain', # rain night
-            '11d': 'fas fa-bolt',          # thunderstorm
-            '11n': 'fas fa-bolt',
-            '13d': 'fas fa-snowflake',     # snow
-            '13n': 'fas fa-snowflake',
-            '50d': 'fas fa-smog',          # mist
-            '50n': 'fas fa-smog'
-        }
-        return icon_mapping.get(weather_code, 'fas fa-cloud')
+        return _ICON_MAP.get(weather_code, _DEFAULT_ICON)
 
 # Initialize weather service
 weather_service = WeatherService(OPENWEATHER_API_KEY)
 
-@app.route('/api/weather/current', methods=['GET'])
-def get_current_weather():
-    """Get current weather for a city or coordinates"""
-    city = request.args.get('city')
-    lat = request.args.get('lat')
-    lon = request.args.get('lon')
-    
-    if not city and not (lat and lon):
-        return jsonify({'error': 'City name or coordinates required'}), 400
-    
-    # Get current weather
-    current_data = weather_service.get_current_weather(city=city, lat=lat, lon=lon)
-    if not current_data:
-        return jsonify({'error': 'Weather data not available'}), 404
+# Worker pool for issuing OpenWeather requests concurrently
+_executor = ThreadPoolExecutor(max_workers=8)
+
+# Upper bound on cities accepted by the batch endpoint
+MAX_BATCH_CITIES = 20
+
+# Separate pool for batch fan-out so large batches don't starve /complete
+_batch_executor = ThreadPoolExecutor(max_workers=8)
+
+# Client/CDN cache lifetimes (seconds) for GET responses
+CURRENT_MAX_AGE = 300
+FORECAST_MAX_AGE = 1800
+
+def _parse_query(args):
+    """Parse city or lat/lon query parameters into (city, lat, lon), or None if invalid"""
+    city = (args.get('city') or '').strip()
+    if city:
+        return city, None, None
     
-    # Format response
+    lat = args.get('lat', type=float)
+    lon = args.get('lon', type=float)
+    if lat is None or lon is None or not (-90 <= lat <= 90 and -180 <= lon <= 180):
+        return None
+    return None, lat, lon
+
+def _until_local_midnight(forecast_data, max_age):
+    """Cap max_age so relative day labels ('Today', 'Tomorrow') expire at the city's midnight"""
+    utc_offset = forecast_data.get('city', {}).get('timezone', 0)
+    return min(max_age, 86400 - (int(time.time()) + utc_offset) % 86400)
+
+def _cacheable_json(body, max_age, stale=False):
+    """Build a JSON response with ETag and Cache-Control, answering 304 if unchanged"""
+    response = jsonify(body)
+    response.set_etag(hashlib.blake2b(response.get_data(), digest_size=8).hexdigest(), weak=True)
+    if stale:
+        # Fallback data from an upstream outage must not be cached downstream
+        response.cache_control.no_cache = True
+    else:
+        response.cache_control.public = True
+        response.cache_control.max_age = max_age
+    return response.make_conditional(request)
+
+def _format_current(current_data):
+    """Format raw OpenWeather current weather data for the frontend"""
     weather_info = {
         'city': current_data['name'],
         'country': current_data['sys']['country'],
@@ -141,84 +414,131 @@ def get_current_weather():
         'uvIndex': 5  # UV index requires separate API call, using placeholder
     }
     
-    return jsonify(weather_info)
+    return weather_info
 
-@app.route('/api/weather/forecast', methods=['GET'])
-def get_weather_forecast():
-    """Get 5-day weather forecast"""
-    city = request.args.get('city')
-    lat = request.args.get('lat')
-    lon = request.args.get('lon')
-    
-    if not city and not (lat and lon):
-        return jsonify({'error': 'City name or coordinates required'}), 400
-    
-    # Get forecast data
-    forecast_data = weather_service.get_forecast(city=city, lat=lat, lon=lon)
-    if not forecast_data:
-        return jsonify({'error': 'Forecast data not available'}), 404
-    
-    # Process forecast data (get daily forecasts)
-    daily_forecasts = {}
-    for item in forecast_data['list']:
-        date = datetime.fromtimestamp(item['dt']).date()
-        if date not in daily_forecasts:
-            daily_forecasts[date] = {
-                'temps': [],
-                'descriptions': [],
-                'icons': []
-            }
-        
-        daily_forecasts[date]['temps'].append(item['main']['temp'])
-        daily_forecasts[date]['descriptions'].append(item['weather'][0]['description'])
-        daily_forecasts[date]['icons'].append(item['weather'][0]['icon'])
+def _format_forecast(forecast_data):
+    """Format raw OpenWeather forecast data into daily forecasts"""
+    # Group the 3-hourly entries by day index in the city's local time
+    utc_offset = forecast_data.get('city', {}).get('timezone', 0)
+    items = sorted(forecast_data['list'], key=itemgetter('dt'))
+    daily_forecasts = groupby(items, key=lambda item: (item['dt'] + utc_offset) // 86400)
     
     # Format daily forecasts
     forecast_list = []
-    today = datetime.now().date()
+    today = (int(time.time()) + utc_offset) // 86400
     
-    for i, (date, data) in enumerate(list(daily_forecasts.items())[:5]):
-        if date == today:
+    for day, group in islice(daily_forecasts, 5):
+        group = list(group)
+        if day == today:
             day_name = 'Today'
-        elif date == today + timedelta(days=1):
+        elif day == today + 1:
             day_name = 'Tomorrow'
         else:
-            day_name = date.strftime('%A')
+            day_name = datetime.fromtimestamp(day * 86400, timezone.utc).strftime('%A')
+        
+        temps = [item['main']['temp'] for item in group]
+        description = Counter(item['weather'][0]['description'] for item in group).most_common(1)[0][0]
+        icon = Counter(item['weather'][0]['icon'] for item in group).most_common(1)[0][0]
         
         forecast_list.append({
             'day': day_name,
-            'high': round(max(data['temps'])),
-            'low': round(min(data['temps'])),
-            'description': max(set(data['descriptions']), key=data['descriptions'].count),
-            'icon': weather_service.get_weather_icon_class(max(set(data['icons']), key=data['icons'].count))
+            'high': round(max(temps)),
+            'low': round(min(temps)),
+            'description': description,
+            'icon': weather_service.get_weather_icon_class(icon)
         })
     
-    return jsonify(forecast_list)
+    return forecast_list
+
+@app.route('/api/weather/current', methods=['GET'])
+def get_current_weather():
+    """Get current weather for a city or coordinates"""
+    query = _parse_query(request.args)
+    if query is None:
+        return jsonify({'error': 'City name or valid coordinates required'}), 400
+    city, lat, lon = query
+    
+    # Get current weather
+    current_data = weather_service.get_current_weather(city=city, lat=lat, lon=lon)
+    if not current_data:
+        return jsonify({'error': 'Weather data not available'}), 404
+    
+    return _cacheable_json(_format_current(current_data), CURRENT_MAX_AGE,
+                           stale=current_data.get(_STALE_KEY, False))
+
+@app.route('/api/weather/forecast', methods=['GET'])
+def get_weather_forecast():
+    """Get 5-day weather forecast"""
+    query = _parse_query(request.args)
+    if query is None:
+        return jsonify({'error': 'City name or valid coordinates required'}), 400
+    city, lat, lon = query
+    
+    # Get forecast data
+    forecast_data = weather_service.get_forecast(city=city, lat=lat, lon=lon)
+    if not forecast_data:
+        return jsonify({'error': 'Forecast data not available'}), 404
+    
+    return _cacheable_json(_format_forecast(forecast_data), _until_local_midnight(forecast_data, FORECAST_MAX_AGE),
+                           stale=forecast_data.get(_STALE_KEY, False))
 
 @app.route('/api/weather/complete', methods=['GET'])
 def get_complete_weather():
     """Get both current weather and forecast in one request"""
-    city = request.args.get('city')
-    lat = request.args.get('lat')
-    lon = request.args.get('lon')
+    query = _parse_query(request.args)
+    if query is None:
+        return jsonify({'error': 'City name or valid coordinates required'}), 400
+    city, lat, lon = query
     
-    if not city and not (lat and lon):
-        return jsonify({'error': 'City name or coordinates required'}), 400
+    # Fetch current weather and forecast concurrently
+    current_future = _executor.submit(weather_service.get_current_weather, city=city, lat=lat, lon=lon)
+    forecast_future = _executor.submit(weather_service.get_forecast, city=city, lat=lat, lon=lon)
+    wait([current_future, forecast_future])
     
-    # Get current weather
-    current_response = get_current_weather()
-    if current_response.status_code != 200:
-        return current_response
+    current_data = current_future.result()
+    if not current_data:
+        return jsonify({'error': 'Weather data not available'}), 404
     
-    # Get forecast
-    forecast_response = get_weather_forecast()
-    if forecast_response.status_code != 200:
-        return forecast_response
+    forecast_data = forecast_future.result()
+    if not forecast_data:
+        return jsonify({'error': 'Forecast data not available'}), 404
     
-    return jsonify({
-        'current': current_response.get_json(),
-        'forecast': forecast_response.get_json()
-    })
+    return _cacheable_json({
+        'current': _format_current(current_data),
+        'forecast': _format_forecast(forecast_data)
+    }, _until_local_midnight(forecast_data, CURRENT_MAX_AGE),
+       stale=current_data.get(_STALE_KEY, False) or forecast_data.get(_STALE_KEY, False))
+
+@app.route('/api/weather/batch', methods=['POST'])
+def get_batch_weather():
+    """Get current weather for several cities in one request"""
+    payload = request.get_json(silent=True)
+    cities = payload.get('cities') if isinstance(payload, dict) else None
+    
+    if not isinstance(cities, list) or not cities or not all(isinstance(c, str) and c.strip() for c in cities):
+        return jsonify({'error': 'A non-empty list of city names is required'}), 400
+    if len(cities) > MAX_BATCH_CITIES:
+        return jsonify({'error': f'At most {MAX_BATCH_CITIES} cities per request'}), 400
+    
+    # Fetch each distinct city once, concurrently
+    futures = {}
+    for city in cities:
+        key = WeatherService.cache_key(city=city)
+        if key not in futures:
+            futures[key] = _batch_executor.submit(weather_service.get_current_weather, city=city.strip())
+    
+    results = {}
+    key_for_future = {future: key for key, future in futures.items()}
+    for future in as_completed(key_for_future):
+        current_data = future.result()
+        results[key_for_future[future]] = _format_current(current_data) if current_data else None
+    
+    batch = []
+    for city in cities:
+        weather_info = results[WeatherService.cache_key(city=city)]
+        batch.append(weather_info or {'query': city, 'error': 'Weather data not available'})
+    
+    return jsonify(batch)
 
 @app.route('/api/health', methods=['GET'])
 def health_check():
@@ -226,7 +546,11 @@ def health_check():
     return jsonify({
         'status': 'healthy',
         'timestamp': datetime.now().isoformat(),
-        'api_key_configured': bool(OPENWEATHER_API_KEY and OPENWEATHER_API_KEY != 'your_api_key_here')
+        'api_key_configured': bool(OPENWEATHER_API_KEY and OPENWEATHER_API_KEY != 'your_api_key_here'),
+        'cache': {
+            'current': weather_service.current_cache.stats(),
+            'forecast': weather_service.forecast_cache.stats()
+        }
     })
 
 @app.errorhandler(404)
@@ -238,13 +562,16 @@ def internal_error(error):
     return jsonify({'error': 'Internal server error'}), 500
 
 if __name__ == '__main__':
-    print("Starting Weather API Server...")
-    print(f"API Key configured: {bool(OPENWEATHER_API_KEY and OPENWEATHER_API_KEY != 'your_api_key_here')}")
-    print("Available endpoints:")
-    print("  GET /api/weather/current?city=CityName")
-    print("  GET /api/weather/forecast?city=CityName")
-    print("  GET /api/weather/complete?city=CityName")
-    print("  GET /api/health")
-    print("\nServer running on http://localhost:5000")
-    
-    app.run(debug=True, host='0.0.0.0', port=5000)
\ No newline at end of file
+    # Development server only. In production run under a WSGI server, e.g.:
+    #   gunicorn -w 4 -k gthread --threads 8 weather_api:app
+    logger.info("Starting Weather API Server...")
+    logger.info("API Key configured: %s", bool(OPENWEATHER_API_KEY and OPENWEATHER_API_KEY != 'your_api_key_here'))
+    logger.info("Available endpoints:")
+    logger.info("  GET /api/weather/current?city=CityName")
+    logger.info("  GET /api/weather/forecast?city=CityName")
+    logger.info("  GET /api/weather/complete?city=CityName")
+    logger.info("  POST /api/weather/batch {\"cities\": [...]}")
+    logger.info("  GET /api/health")
+    logger.info("Server running on http://localhost:5000")
+    
+    app.run(host='0.0.0.0', port=5000)